@@ -1,11 +1,18 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
+import polars as pl
 from pathlib import Path
+import concurrent.futures
+import functools
+import itertools
+
+from data import load_and_clean_data, load_and_clean_data_from_path, option_lists
 import time
+import random
 import re
-import json
 import ast
+import orjson
 import requests
 
 # --- Page Configuration ---
@@ -110,74 +117,128 @@ SOURCE_TO_WOM_METRIC = {
     "venenatis": "venenatis",
 }
 
-# --- 1. Data Cleaning Engine ---
+# Categories that have WOM boss metrics, as a frozenset so the tab
+# filters do hash probes against a constant instead of dict lookups.
+_WOM_CATEGORY_KEYS = frozenset(CATEGORY_TO_WOM_BOSSES)
+
+# Supported metrics per category, filtered once at import instead of on
+# every category pick in the KC tab.
+_SUPPORTED_METRICS_BY_CATEGORY = {
+    category: tuple(m for m in metrics if m in SUPPORTED_WOM_BOSS_METRICS)
+    for category, metrics in CATEGORY_TO_WOM_BOSSES.items()
+}
+
+# Every supported metric referenced by a category, resolved once at
+# import; both dicts above are constants so this never changes at runtime.
+PREFETCH_METRICS = tuple(sorted({
+    metric
+    for category_metrics in CATEGORY_TO_WOM_BOSSES.values()
+    for metric in category_metrics
+    if metric in SUPPORTED_WOM_BOSS_METRICS
+}))
+
+def _px():
+    # Deferred: plotly's import costs ~150 ms of cold start, only pay it
+    # when a chart is actually built (sys.modules makes repeats free).
+    import plotly.express as px
+    return px
+
+
+# Figure builders are cached on the small aggregated records feeding
+# them, so switching tabs or unrelated widgets reuses the built figure
+# instead of re-serializing the full Plotly JSON.
+@st.cache_data(show_spinner=False)
+def _player_bar(player_records):
+    px = _px()
+    fig = px.bar(pd.DataFrame(player_records), x='Points', y='Player', orientation='h', text='Points', color='Points')
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _item_bar(item_records):
+    px = _px()
+    fig = px.bar(pd.DataFrame(item_records), x='Count', y='Item', orientation='h', title="Top Drops by Quantity")
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+
 @st.cache_data
-def load_and_clean_data(file):
-    try:
-        # Load the CSV
-        df = pd.read_csv(file)
-        
-        # 1. FILTER: Remove the "malformed" test row (Entry #1899)
-        df = df[df['Team'] != '-']
-        
-        # 2. SELECT: We now grab 'Awarded Points' as our primary source
-        # We rename 'Awarded Points' to 'Points' for the app to use
-        # We keep 'Points' as 'Base_Points' just in case we want to compare later
-        
-        # Check if 'Awarded Points' exists, otherwise default to 'Points'
-        if 'Awarded Points' in df.columns:
-            df['Final_Points'] = df['Awarded Points'].fillna(df['Points'])
-        else:
-            df['Final_Points'] = df['Points']
-
-        target_cols = ['Date', 'Player Name', 'Team', 'Tile', 'Item Received', 'Final_Points']
-        
-        # Check for missing columns
-        if not all(col in df.columns for col in target_cols):
-             # Fallback for older CSV versions if names differ
-            st.error(f"Missing columns. Found: {df.columns.tolist()}")
-            return pd.DataFrame()
-
-        df = df[target_cols]
-        
-        # 3. RENAME: Standardize
-        df.columns = ['Date', 'Player', 'Team', 'Category', 'Item', 'Points']
-        df['Player'] = (
-            df['Player']
-            .astype(str)
-            .str.strip()
-            .str.lower()
-            .str.replace(r'\s+', '', regex=True)
-        )
-        
-        # 4. FORMAT: Convert types
-        df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce')
-        df['Points'] = pd.to_numeric(df['Points'], errors='coerce').fillna(0)
-        df['Quantity'] = 1
-        
-        return df
-        
-    except Exception as e:
-        st.error(f"Error processing file: {e}")
-        return pd.DataFrame()
+def _item_counts(df):
+    # (Category, Item) drop counts, computed once per CSV load; the Item
+    # Stats tab slices this instead of re-running value_counts per rerun.
+    return df.groupby(['Category', 'Item'], sort=False, observed=True).size()
+
+
+def _points_by(df, col):
+    series = df[col]
+    if len(df) > 100_000 and isinstance(series.dtype, pd.CategoricalDtype):
+        # Very large logs: np.bincount over the category codes is a single
+        # C pass with no hashing, noticeably faster than groupby.sum().
+        codes = series.cat.codes.to_numpy()
+        values = df['Points'].to_numpy()
+        valid = codes >= 0
+        totals = np.bincount(codes[valid], weights=values[valid], minlength=len(series.cat.categories))
+        return pd.Series(totals, index=pd.Index(series.cat.categories, name=col), name='Points')
+    return df.groupby(col, sort=False, observed=True)['Points'].sum()
+
+
+@st.cache_data
+def _category_row_indices(df):
+    # Row positions per category, computed once per CSV load; slicing
+    # with df.take on these skips the O(N) boolean-mask scan per rerun.
+    return df.groupby('Category', sort=False, observed=True).indices
+
+
+@st.cache_data
+def team_cube(df):
+    # One (Team, Category, Player, Item) cube per CSV load; the team tab
+    # slices it with .xs instead of re-filtering the full frame.
+    return df.groupby(['Team', 'Category', 'Player', 'Item'], sort=False, observed=True)['Points'].sum()
+
+
+@st.cache_data
+def rankings_by(df, key):
+    # One (key, Player) cube per CSV load; each selectbox change then
+    # slices O(groups) instead of re-filtering and re-grouping O(rows).
+    return (
+        df.groupby([key, 'Player'], sort=False, observed=True)['Points']
+        .sum()
+        .sort_values(ascending=False)
+    )
+
+
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+_WOM_FAILURE_RE = re.compile(r"request failed|rate limited", re.IGNORECASE)
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_name(name):
-    return re.sub(r"[^a-z0-9]+", "", str(name or "").strip().lower())
+    return _NORM_RE.sub("", str(name or "").strip().lower())
 
 
+# Alias lookups pre-normalized once at import; the per-call loop over
+# WOM_PLAYER_ALIASES is gone.
+_WOM_ALIAS_RAW = {k: _normalize_name(v) for k, v in WOM_PLAYER_ALIASES.items()}
+_WOM_ALIAS_NORMALIZED = {_normalize_name(k): v for k, v in _WOM_ALIAS_RAW.items()}
+
+
+@functools.lru_cache(maxsize=4096)
 def _resolve_csv_player_to_wom_key(player_name):
     raw_name = str(player_name).strip()
-    alias_target = WOM_PLAYER_ALIASES.get(raw_name)
-    if alias_target is None:
-        normalized_raw_name = _normalize_name(raw_name)
-        for alias_source, alias_value in WOM_PLAYER_ALIASES.items():
-            if _normalize_name(alias_source) == normalized_raw_name:
-                alias_target = alias_value
-                break
-    if alias_target:
-        return _normalize_name(alias_target)
-    return _normalize_name(raw_name)
+    return (
+        _WOM_ALIAS_RAW.get(raw_name)
+        or _WOM_ALIAS_NORMALIZED.get(_normalize_name(raw_name))
+        or _normalize_name(raw_name)
+    )
+
+
+@st.cache_data
+def wom_key_map(players):
+    # The Player -> WOM key mapping is pure, so resolve the whole roster
+    # once per CSV load and let every tab share the cached dict instead
+    # of re-resolving names on each interaction.
+    return {player: _resolve_csv_player_to_wom_key(player) for player in players}
 
 
 def _wom_retry_delay_seconds(response, attempt):
@@ -187,7 +248,9 @@ def _wom_retry_delay_seconds(response, attempt):
             return max(float(retry_after), WOM_BASE_BACKOFF_SECONDS)
         except ValueError:
             pass
-    return WOM_BASE_BACKOFF_SECONDS * attempt
+    # Jittered exponential backoff, capped at a minute, so parallel
+    # workers hitting the same 429 don't all retry in lockstep.
+    return min(60.0, WOM_BASE_BACKOFF_SECONDS * 2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
 
 
 def _extract_player_name_from_row(row):
@@ -210,33 +273,64 @@ def _extract_player_name_from_row(row):
     return None
 
 
+# WOM answers with one consistent payload shape in practice; once a key
+# path has matched, later responses try it first and skip the probing.
+_WOM_ROWS_PATH = None
+
+
+def _rows_at_path(response_json, path):
+    node = response_json
+    for key in path:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return node if isinstance(node, list) else None
+
+
 def _extract_rows_from_group_response(response_json):
+    global _WOM_ROWS_PATH
     if isinstance(response_json, list):
         return response_json
     if not isinstance(response_json, dict):
         return []
 
+    if _WOM_ROWS_PATH is not None:
+        rows = _rows_at_path(response_json, _WOM_ROWS_PATH)
+        if rows is not None:
+            return rows
+
     data = response_json.get("data")
     if isinstance(data, list):
+        _WOM_ROWS_PATH = ("data",)
         return data
     if isinstance(data, dict):
         for key in ("records", "entries", "results", "members", "leaderboard"):
             candidate = data.get(key)
             if isinstance(candidate, list):
+                _WOM_ROWS_PATH = ("data", key)
                 return candidate
     for key in ("records", "entries", "results", "members", "leaderboard"):
         candidate = response_json.get(key)
         if isinstance(candidate, list):
+            _WOM_ROWS_PATH = (key,)
             return candidate
     return []
 
 
-@st.cache_data(ttl=21600)
-def _fetch_wom_group_metric_success(group_id, metric_name, start_date_str, end_date_str):
+# One shared Session keeps the TCP+TLS connection to the WOM API alive
+# across the ~20 per-metric fetches instead of a fresh handshake each.
+_WOM_SESSION = requests.Session()
+_WOM_SESSION.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4),
+)
+
+
+def _wom_http_get_raw(group_id, metric_name, start_date_str, end_date_str):
     url = f"{WOM_API_BASE_URL}/groups/{group_id}/gained"
     params = {"metric": metric_name, "startDate": start_date_str, "endDate": end_date_str}
 
-    response = requests.get(url, params=params, timeout=20)
+    response = _WOM_SESSION.get(url, params=params, timeout=20)
     if response.status_code == 404:
         return {}, f"Group {group_id} not found on Wise Old Man"
     response.raise_for_status()
@@ -259,13 +353,18 @@ def _fetch_wom_group_metric_success(group_id, metric_name, start_date_str, end_d
     return gains_by_player, None
 
 
+# Caching the whole retry loop (not the raw HTTP call) means retries
+# always hit the network and only the final resolved value is memoized;
+# with the inner call cached, a 429 would poison the cache and every
+# "retry" would replay the cached failure.
+@st.cache_data(ttl=21600)
 def fetch_wom_group_metric(group_id, metric_name, start_date_str, end_date_str):
     url = f"{WOM_API_BASE_URL}/groups/{group_id}/gained"
     params = {"metric": metric_name, "startDate": start_date_str, "endDate": end_date_str}
 
     for attempt in range(1, WOM_MAX_RETRIES + 1):
         try:
-            return _fetch_wom_group_metric_success(group_id, metric_name, start_date_str, end_date_str)
+            return _wom_http_get_raw(group_id, metric_name, start_date_str, end_date_str)
         except requests.HTTPError as exc:
             response = exc.response
             if response is not None and response.status_code == 429 and attempt < WOM_MAX_RETRIES:
@@ -279,7 +378,9 @@ def fetch_wom_group_metric(group_id, metric_name, start_date_str, end_date_str):
             return {}, f"Wise Old Man request failed: {exc}"
         except requests.RequestException as exc:
             if attempt < WOM_MAX_RETRIES:
-                time.sleep(WOM_BASE_BACKOFF_SECONDS * attempt)
+                time.sleep(
+                    min(60.0, WOM_BASE_BACKOFF_SECONDS * 2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+                )
                 continue
             return {}, f"Wise Old Man request failed: {exc}"
 
@@ -290,20 +391,119 @@ def fetch_wom_group_metric(group_id, metric_name, start_date_str, end_date_str):
 def prefetch_wom_group_metrics_bundle(group_id, metrics, start_date_str, end_date_str):
     kc_by_metric = {}
     errors = []
-    for metric_name in sorted(set(metrics)):
-        metric_gains, error_msg = fetch_wom_group_metric(
-            group_id,
-            metric_name,
-            start_date_str,
-            end_date_str
-        )
-        if error_msg:
-            errors.append(f"{metric_name}: {error_msg}")
-            continue
-        kc_by_metric[metric_name] = metric_gains
+    # IO-bound: fetch metrics concurrently so cold-start latency is the
+    # slowest batch of responses, not the sum of ~20 round trips.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        future_to_metric = {
+            executor.submit(
+                fetch_wom_group_metric,
+                group_id,
+                metric_name,
+                start_date_str,
+                end_date_str,
+            ): metric_name
+            for metric_name in sorted(set(metrics))
+        }
+        for future in concurrent.futures.as_completed(future_to_metric):
+            metric_name = future_to_metric[future]
+            metric_gains, error_msg = future.result()
+            if error_msg:
+                errors.append(f"{metric_name}: {error_msg}")
+                continue
+            kc_by_metric[metric_name] = metric_gains
+    errors.sort()
     return kc_by_metric, errors
 
 
+@functools.lru_cache(maxsize=8)
+def _read_wom_cache_payload(path_str, mtime_ns):
+    # Keyed on mtime: the 5-minute TTL below can re-run, but an unchanged
+    # file skips the parse entirely. orjson works on bytes, so the
+    # utf-8-sig BOM (the file is committed from Windows) is stripped by hand.
+    raw = Path(path_str).read_bytes()
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
+    return orjson.loads(raw)
+
+
+# Bump when the sidecar layout changes so stale files are rebuilt.
+WOM_PARQUET_VERSION = 1
+
+
+@functools.lru_cache(maxsize=8)
+def _wom_cache_metric_maps(path_str, mtime_ns):
+    # Same sidecar idea as the event CSV: a one-time converted Parquet
+    # copy (metric, player, gained) skips JSON parsing and per-value
+    # float coercion entirely on later cold starts.
+    parquet_path = Path(path_str).with_suffix(f".v{WOM_PARQUET_VERSION}.parquet")
+    try:
+        if parquet_path.exists() and parquet_path.stat().st_mtime_ns >= mtime_ns:
+            flat = pl.read_parquet(parquet_path)
+            maps = {}
+            for key, part in flat.group_by("metric"):
+                metric_name = key[0] if isinstance(key, tuple) else key
+                maps[metric_name] = dict(zip(part["player"].to_list(), part["gained"].to_list()))
+            return maps
+    except Exception:
+        pass
+
+    # Name/float coercion done once per file version; TTL expiries of the
+    # loader below then just select metrics instead of rebuilding every
+    # per-player dict from the raw payload.
+    payload = _read_wom_cache_payload(path_str, mtime_ns)
+    file_metrics = payload.get("metrics", {})
+    if not isinstance(file_metrics, dict):
+        return {}
+
+    normalized = {}
+    for metric_name, metric_map in file_metrics.items():
+        if not isinstance(metric_map, dict):
+            continue
+        try:
+            # Fast path: one comprehension when every value coerces.
+            normalized[metric_name] = {str(k): float(v or 0) for k, v in metric_map.items()}
+        except (TypeError, ValueError):
+            cleaned = {}
+            for player_key, gained_value in metric_map.items():
+                try:
+                    cleaned[str(player_key)] = float(gained_value or 0)
+                except (TypeError, ValueError):
+                    cleaned[str(player_key)] = 0.0
+            normalized[metric_name] = cleaned
+
+    if normalized:
+        try:
+            metric_col, player_col, gained_col = [], [], []
+            for metric_name, metric_map in normalized.items():
+                metric_col.extend([metric_name] * len(metric_map))
+                player_col.extend(metric_map.keys())
+                gained_col.extend(metric_map.values())
+            pl.DataFrame(
+                {"metric": metric_col, "player": player_col, "gained": gained_col}
+            ).write_parquet(parquet_path, compression="zstd")
+        except Exception:
+            # Read-only deployments still work, just without the sidecar.
+            pass
+    return normalized
+
+
+@st.cache_data
+def _kc_range_caption(start_date, end_date):
+    # The event range never changes within a session; format it once
+    # instead of per rerun (the format spec stays on the C fast path).
+    return f"Wise Old Man KC range: {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}"
+
+
+@functools.lru_cache(maxsize=8)
+def _missing_metrics_note(requested_metrics, available_metrics):
+    # Requested and available metric sets are constant per session, so
+    # the set-difference/sort/join only ever runs once per combination.
+    missing = sorted(set(requested_metrics) - set(available_metrics))
+    if not missing:
+        return None
+    return "Missing metrics in WOM cache: " + ", ".join(missing[:12])
+
+
 @st.cache_data(ttl=300)
 def load_wom_group_metrics_from_file(cache_path, group_id, start_date_str, end_date_str, metrics):
     file_path = Path(cache_path)
@@ -311,7 +511,8 @@ def load_wom_group_metrics_from_file(cache_path, group_id, start_date_str, end_d
         return {}, [f"WOM cache file not found: {file_path.name}"]
 
     try:
-        payload = json.loads(file_path.read_text(encoding="utf-8-sig"))
+        mtime_ns = file_path.stat().st_mtime_ns
+        payload = _read_wom_cache_payload(str(file_path), mtime_ns)
     except Exception as exc:
         return {}, [f"Failed to read WOM cache file: {exc}"]
 
@@ -339,21 +540,16 @@ def load_wom_group_metrics_from_file(cache_path, group_id, start_date_str, end_d
     if not isinstance(file_metrics, dict):
         return {}, notes + ["WOM cache format invalid: metrics should be an object"]
 
+    metric_maps = _wom_cache_metric_maps(str(file_path), mtime_ns)
     kc_by_metric = {}
     for metric_name in metrics:
-        metric_map = file_metrics.get(metric_name)
-        if isinstance(metric_map, dict):
-            normalized_metric_map = {}
-            for player_key, gained_value in metric_map.items():
-                try:
-                    normalized_metric_map[str(player_key)] = float(gained_value or 0)
-                except (TypeError, ValueError):
-                    normalized_metric_map[str(player_key)] = 0.0
-            kc_by_metric[metric_name] = normalized_metric_map
+        metric_map = metric_maps.get(metric_name)
+        if metric_map is not None:
+            kc_by_metric[metric_name] = metric_map
 
-    missing_metrics = sorted(set(metrics) - set(kc_by_metric.keys()))
-    if missing_metrics:
-        notes.append("Missing metrics in WOM cache: " + ", ".join(missing_metrics[:12]))
+    missing_note = _missing_metrics_note(metrics, frozenset(kc_by_metric))
+    if missing_note:
+        notes.append(missing_note)
 
     return kc_by_metric, notes
 
@@ -422,8 +618,9 @@ def load_spoon_config_from_message(file_path):
     return boss_speeds, items_db, notes
 
 
-def _norm_source_name(name):
-    return re.sub(r"[^a-z0-9]+", "", str(name or "").strip().lower())
+# Same normalization as player names — share the compiled pattern and
+# memo instead of re-running re.sub with a string literal per call.
+_norm_source_name = _normalize_name
 
 
 def _build_metric_drop_profile(items_db):
@@ -447,12 +644,17 @@ def _build_metric_drop_profile(items_db):
     return profile
 
 
+# Cached so toggling unrelated widgets replays the stored result;
+# Streamlit hashes every argument (frames and dicts included), so a new
+# CSV load or fresh WOM pull still recomputes.
+@st.cache_data(show_spinner=False)
 def build_spooned_index(
     category_df,
     selected_boss_metrics,
     prefetched_kc_by_metric,
     boss_speeds,
-    items_db
+    items_db,
+    wom_key_by_player
 ):
     if category_df.empty:
         return pd.DataFrame(), None, None, []
@@ -465,6 +667,13 @@ def build_spooned_index(
     if unsupported_metrics:
         errors.append("Unsupported WOM metrics skipped: " + ", ".join(unsupported_metrics))
 
+    # Nothing to rank without WOM data (the usual state before the cache
+    # warms) — skip the whole per-player pass instead of emitting a table
+    # of zeros.
+    if not valid_metrics or not any(prefetched_kc_by_metric.get(m) for m in valid_metrics):
+        errors.append("No WOM metrics available for this category.")
+        return pd.DataFrame(), start_date, end_date, errors
+
     speed_by_metric = {}
     for boss_name, speed in boss_speeds.items():
         metric_name = SOURCE_TO_WOM_METRIC.get(_norm_source_name(boss_name))
@@ -494,35 +703,32 @@ def build_spooned_index(
                     ehb_hours_by_player.get(normalized_player, 0.0) + (kc_gain / metric_speed)
                 )
 
-    rows = []
-    missing_from_wom = []
-    for player in sorted(category_df["Player"].dropna().unique()):
-        player_points = float(category_df.loc[category_df["Player"] == player, "Points"].sum())
-        wom_lookup_key = _resolve_csv_player_to_wom_key(player)
-        player_kc_gain = kc_by_player.get(wom_lookup_key, 0.0)
-        player_ehb_hours = ehb_hours_by_player.get(wom_lookup_key, 0.0)
-        player_expected_points = expected_points_by_player.get(wom_lookup_key, 0.0)
-        if player_kc_gain == 0 and player_points > 0:
-            missing_from_wom.append(str(player))
-        spooned_index = (player_points / player_kc_gain) if player_kc_gain > 0 else None
-        rate_luck_index = (player_points / player_expected_points) if player_expected_points > 0 else None
-
-        rows.append(
-            {
-                "Player": player,
-                "Points": round(player_points, 2),
-                "KC Gain": round(player_kc_gain, 2),
-                "EHB Hours": round(player_ehb_hours, 2),
-                "Expected Points": round(player_expected_points, 2),
-                "Spooned Index": round(spooned_index, 3) if spooned_index is not None else None,
-                "Rate Luck Index": round(rate_luck_index, 3) if rate_luck_index is not None else None,
-            }
-        )
-
-    spoon_df = pd.DataFrame(rows)
+    # One grouped sum instead of re-scanning the frame once per player,
+    # then vectorized column arithmetic instead of per-row dict building.
+    points_by_player = category_df.groupby("Player", sort=True, observed=True)["Points"].sum()
+    spoon_df = points_by_player.astype(float).rename("Points").reset_index()
     if spoon_df.empty:
         return spoon_df, start_date, end_date, errors
 
+    wom_keys = spoon_df["Player"].map(
+        lambda p: wom_key_by_player.get(p) or _resolve_csv_player_to_wom_key(p)
+    )
+    spoon_df["KC Gain"] = wom_keys.map(kc_by_player).fillna(0.0)
+    spoon_df["EHB Hours"] = wom_keys.map(ehb_hours_by_player).fillna(0.0)
+    spoon_df["Expected Points"] = wom_keys.map(expected_points_by_player).fillna(0.0)
+
+    missing_mask = (spoon_df["KC Gain"] == 0) & (spoon_df["Points"] > 0)
+    missing_from_wom = spoon_df.loc[missing_mask, "Player"].astype(str).tolist()
+
+    spoon_df["Spooned Index"] = (
+        (spoon_df["Points"] / spoon_df["KC Gain"]).where(spoon_df["KC Gain"] > 0).round(3)
+    )
+    spoon_df["Rate Luck Index"] = (
+        (spoon_df["Points"] / spoon_df["Expected Points"]).where(spoon_df["Expected Points"] > 0).round(3)
+    )
+    value_cols = ["Points", "KC Gain", "EHB Hours", "Expected Points"]
+    spoon_df[value_cols] = spoon_df[value_cols].round(2)
+
     spoon_df = spoon_df.sort_values(
         by=["Rate Luck Index", "Spooned Index", "Points"],
         ascending=[False, False, False],
@@ -541,6 +747,438 @@ def build_spooned_index(
 
     return spoon_df, start_date, end_date, errors
 
+# Fragment-scoped tab renderers: interacting with a widget inside one
+# tab re-runs only that fragment instead of rebuilding every other tab.
+@st.fragment
+def _render_leaderboards(team_points, player_points):
+    c1, c2 = st.columns(2)
+
+    with c1:
+        st.subheader("Team Standings (Official)")
+        # Reuse the Team aggregation computed once in main()
+        team_df = team_points.reset_index().sort_values('Points', ascending=False)
+        team_df.index = range(1, len(team_df) + 1)
+
+        # %g drops the trailing .0 on whole numbers in the frontend; no
+        # per-cell Python formatting and the column stays numeric so
+        # table sorting works.
+        st.dataframe(
+            team_df,
+            column_config={'Points': st.column_config.NumberColumn(format='%g')},
+            use_container_width=True
+        )
+
+    with c2:
+        st.subheader("Top 10 Players")
+        player_df = player_points.nlargest(10).reset_index()
+        fig_player = _player_bar(player_df.to_dict('records'))
+        st.plotly_chart(fig_player, use_container_width=True)
+
+
+@st.fragment
+def _render_item_stats(df, category_options):
+    col_filter, col_chart = st.columns([1, 3])
+
+    with col_filter:
+        st.write("### Filters")
+        selected_category = st.selectbox("Filter by Tile/Category", ["All"] + category_options)
+
+    with col_chart:
+        if selected_category == 'All':
+            viz_df = df
+        else:
+            rows = _category_row_indices(df).get(selected_category)
+            viz_df = df.take(rows) if rows is not None else df.iloc[0:0]
+
+        st.subheader(f"Most Acquired Items ({selected_category})")
+        category_item_counts = _item_counts(df)
+        if selected_category == "All":
+            top_items = category_item_counts.groupby(level='Item', observed=True).sum().nlargest(15)
+        else:
+            top_items = category_item_counts.loc[selected_category].nlargest(15)
+        item_counts = top_items.rename('Count').reset_index()
+
+        fig_items = _item_bar(item_counts.to_dict('records'))
+        st.plotly_chart(fig_items, use_container_width=True)
+
+        st.write("### High Value Drops")
+        # Partial sort: keep the 10 newest rows without fully sorting
+        high_value = viz_df.loc[viz_df['Points'] >= 5].nlargest(10, 'Date')
+        st.dataframe(high_value[['Date', 'Player', 'Item', 'Points']], hide_index=True, use_container_width=True)
+
+
+@st.fragment
+def _render_individual_search(df, player_options, player_kc_total, wom_key_by_player):
+    selected_player = st.selectbox("Select a Player", player_options)
+
+    if selected_player:
+        # Masked .loc projection: only the four displayed columns
+        # are copied, and the equality check runs on category codes.
+        p_data = df.loc[df['Player'].eq(selected_player), ['Date', 'Category', 'Item', 'Points']]
+        wom_lookup_key = wom_key_by_player[selected_player]
+        player_total_kc_gain = float(player_kc_total.get(wom_lookup_key, 0.0))
+        player_total_kc_display = (
+            f"{int(player_total_kc_gain):,}"
+            if player_total_kc_gain > 0
+            else "No WoM Data"
+        )
+
+        pk1, pk2, pk3, pk4 = st.columns(4)
+        pk1.metric("Submissions", len(p_data))
+        pk2.metric("Total Points", int(p_data['Points'].sum()))
+        pk3.metric("Favorite Tile", p_data['Category'].mode()[0] if not p_data.empty else "N/A")
+        pk4.metric("WoM KC (Event)", player_total_kc_display)
+
+        st.write(f"### Submission History for {selected_player}")
+        st.dataframe(
+            p_data.sort_values('Date', ascending=False),
+            use_container_width=True
+        )
+
+
+@st.fragment
+def _render_player_rankings(df, category_options, item_options):
+    st.subheader("Top Players by Category")
+    if category_options:
+        selected_rank_category = st.selectbox(
+            "Choose a Category",
+            category_options,
+            key="rank_category"
+        )
+
+        cat_rank_df = (
+            rankings_by(df, 'Category')
+            .loc[selected_rank_category]
+            .reset_index()
+        )
+        cat_rank_df.insert(0, "Rank", range(1, len(cat_rank_df) + 1))
+        st.dataframe(cat_rank_df[['Rank', 'Player', 'Points']], hide_index=True, use_container_width=True)
+    else:
+        st.info("No categories found in the uploaded data.")
+
+    st.divider()
+
+    st.subheader("Top Players by Item")
+    if item_options:
+        selected_rank_item = st.selectbox(
+            "Choose an Item",
+            item_options,
+            key="rank_item"
+        )
+
+        item_rank_df = (
+            rankings_by(df, 'Item')
+            .loc[selected_rank_item]
+            .reset_index()
+        )
+        item_rank_df.insert(0, "Rank", range(1, len(item_rank_df) + 1))
+        st.dataframe(item_rank_df[['Rank', 'Player', 'Points']], hide_index=True, use_container_width=True)
+    else:
+        st.info("No items found in the uploaded data.")
+
+
+@st.fragment
+def _render_team_rankings(df, team_options):
+    st.subheader("Top Players by Team")
+    if team_options:
+        selected_team = st.selectbox("Choose a Team", team_options, key="rank_team")
+
+        # Slice the cached cube: O(groups) index lookups instead of
+        # re-masking the full frame on every dropdown change.
+        team_slice = team_cube(df).xs(selected_team, level='Team')
+        team_player_rank_df = (
+            team_slice.groupby(level='Player', observed=True)
+            .sum()
+            .sort_values(ascending=False)
+            .reset_index()
+        )
+        team_player_rank_df.insert(0, "Rank", range(1, len(team_player_rank_df) + 1))
+        st.dataframe(
+            team_player_rank_df[['Rank', 'Player', 'Points']],
+            hide_index=True,
+            use_container_width=True
+        )
+
+        st.divider()
+        st.subheader(f"{selected_team} Item Points by Category")
+        # Categorical level: observed categories come back already sorted
+        # (load-time category order), no hash-and-sort pass.
+        team_categories = (
+            team_slice.index.get_level_values('Category')
+            .remove_unused_categories()
+            .categories
+            .tolist()
+        )
+
+        if team_categories:
+            selected_team_category = st.selectbox(
+                "Choose a Category",
+                team_categories,
+                key="rank_team_category"
+            )
+
+            team_item_points_df = (
+                team_slice.xs(selected_team_category, level='Category')
+                .groupby(level='Item', observed=True)
+                .sum()
+                .sort_values(ascending=False)
+                .reset_index()
+            )
+            team_item_points_df.insert(0, "Rank", range(1, len(team_item_points_df) + 1))
+
+            px = _px()
+            fig_team_items = px.bar(
+                team_item_points_df.head(20),
+                x='Points',
+                y='Item',
+                orientation='h',
+                text='Points',
+                color='Points',
+                title=f"{selected_team} - {selected_team_category}: Points by Item"
+            )
+            fig_team_items.update_layout(yaxis={'categoryorder': 'total ascending'})
+            st.plotly_chart(fig_team_items, use_container_width=True)
+            st.dataframe(
+                team_item_points_df[['Rank', 'Item', 'Points']],
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            st.info("No categories found for this team.")
+    else:
+        st.info("No teams found in the uploaded data.")
+
+
+@st.fragment
+def _render_highest_kc(df, kc_wide, wom_key_by_player, category_options, player_options, event_start_date_str, event_end_date_str):
+    st.subheader("Highest KC by Category")
+    st.caption(
+        f"Using cached WOM data from {WOM_CACHE_FILE.name} for range "
+        f"{event_start_date_str} to {event_end_date_str}."
+    )
+
+    # option_lists already gives the sorted, NaN-free categories; no
+    # per-rerun unique()+sort pass over the full column.
+    available_kc_categories = sorted(_WOM_CATEGORY_KEYS.intersection(category_options))
+
+    if available_kc_categories:
+        selected_kc_category = st.selectbox(
+            "Choose a Category",
+            available_kc_categories,
+            key="highest_kc_category"
+        )
+        selected_kc_metrics = _SUPPORTED_METRICS_BY_CATEGORY[selected_kc_category]
+
+        if selected_kc_metrics:
+            category_rows = _category_row_indices(df).get(selected_kc_category)
+            category_df = (
+                df.take(category_rows).reset_index(drop=True)
+                if category_rows is not None
+                else df.iloc[0:0]
+            )
+            category_points_by_player = (
+                category_df.groupby("Player", observed=True)["Points"].sum()
+            )
+
+            # One vectorized column sum over the wide KC table instead of
+            # a Python loop over metrics for every player.
+            metric_cols = [m for m in selected_kc_metrics if m in kc_wide.columns]
+            kc_gain_by_key = kc_wide[metric_cols].sum(axis=1) if metric_cols else pd.Series(dtype=float)
+
+            # Whole-roster table in three vectorized maps — no per-player
+            # Python loop building dicts.
+            kc_df = pd.DataFrame({"Player": player_options})
+            wom_keys = kc_df["Player"].map(
+                lambda p: wom_key_by_player.get(p) or _resolve_csv_player_to_wom_key(p)
+            )
+            kc_df["KC Gain"] = wom_keys.map(kc_gain_by_key).fillna(0.0).round(2)
+            kc_df["Points"] = (
+                kc_df["Player"].map(category_points_by_player).fillna(0.0).astype(float).round(2)
+            )
+
+            kc_df = kc_df.sort_values(
+                by=["KC Gain", "Points"],
+                ascending=[False, False]
+            ).reset_index(drop=True)
+            kc_df.insert(0, "Rank", range(1, len(kc_df) + 1))
+
+            px = _px()
+            fig_kc = px.bar(
+                kc_df.head(20),
+                x="KC Gain",
+                y="Player",
+                orientation="h",
+                text="KC Gain",
+                color="KC Gain",
+                title=f"Top KC Gains - {selected_kc_category}"
+            )
+            fig_kc.update_layout(yaxis={"categoryorder": "total ascending"})
+            st.plotly_chart(fig_kc, use_container_width=True)
+            st.dataframe(kc_df, hide_index=True, use_container_width=True)
+        else:
+            st.info("No supported WOM boss metrics are mapped for this category.")
+    else:
+        st.info("No categories available for Highest KC view.")
+
+
+@st.fragment
+def _render_spooned_index(df, category_options, prefetched_kc_by_metric, prefetch_errors,
+                          message_config_notes, boss_speeds, items_db, wom_key_by_player,
+                          event_start_date_str, event_end_date_str):
+    st.subheader("Biggest Spoons by Boss KC Gain")
+    st.caption(
+        f"Using Wise Old Man group pulls (group {WOM_GROUP_ID}, competition ref {WOM_COMPETITION_ID}) "
+        "from a committed cache file for fast category switching."
+    )
+    st.caption(
+        f"Cached WOM event range: {event_start_date_str} to {event_end_date_str} "
+        f"({len(PREFETCH_METRICS)} metrics) from {WOM_CACHE_FILE.name}"
+    )
+    # Set intersection feeds sorted() directly — no membership-tested
+    # listcomp materialized just to be sorted and thrown away.
+    available_spoon_categories = sorted(
+        _WOM_CATEGORY_KEYS.intersection(category_options)
+    )
+
+    if available_spoon_categories:
+        selected_spoon_category = st.selectbox(
+            "Choose a Boss Category",
+            available_spoon_categories,
+            key="spoon_category"
+        )
+        # Tuple so the cache key for build_spooned_index is stable.
+        selected_metrics = tuple(CATEGORY_TO_WOM_BOSSES[selected_spoon_category])
+
+        # take() on the cached positions already yields a new
+        # frame, so no mask scan and no extra copy. Dropping the
+        # scattered source index leaves a plain RangeIndex, which
+        # hashes smaller in the build_spooned_index cache key and
+        # keeps downstream groupby/map passes on contiguous rows.
+        category_rows = _category_row_indices(df).get(selected_spoon_category)
+        spoon_category_df = (
+            df.take(category_rows).reset_index(drop=True)
+            if category_rows is not None
+            else df.iloc[0:0]
+        )
+        # Only this category's metrics matter; the smaller dict also
+        # keeps the cache key stable across unrelated WOM refreshes.
+        kc_subset = {
+            m: prefetched_kc_by_metric[m]
+            for m in selected_metrics
+            if m in prefetched_kc_by_metric
+        }
+        spoon_df, start_date, end_date, fetch_errors = build_spooned_index(
+            spoon_category_df,
+            selected_metrics,
+            kc_subset,
+            boss_speeds,
+            items_db,
+            wom_key_by_player
+        )
+
+        if start_date is not None and end_date is not None:
+            st.caption(_kc_range_caption(start_date, end_date))
+
+        if not spoon_df.empty:
+            # assign() only materializes the one new column;
+            # the rest of each frame shares spoon_df's blocks.
+            display_df = spoon_df.assign(
+                **{"Rate Luck Index": spoon_df["Rate Luck Index"].fillna(0)}
+            )
+            # One np.where over plain arrays; no boolean
+            # Series intermediates or masked row writes.
+            table_df = spoon_df.assign(
+                **{
+                    "WoM Data Status": np.where(
+                        (spoon_df["Points"].to_numpy() > 0)
+                        & (
+                            (spoon_df["KC Gain"].to_numpy() <= 0)
+                            | (spoon_df["Expected Points"].to_numpy() <= 0)
+                        ),
+                        "No WoM Data",
+                        "",
+                    )
+                }
+            )
+
+            # Explicit partial selection on the charted metric rather
+            # than trusting upstream row order; reversed so the
+            # horizontal bars read bottom-up with the order pinned.
+            # keep='first' is stable here (the frame arrives sorted by
+            # Rate Luck Index / Spooned Index / Points) and holds the
+            # cap at 15 bars — keep='all' let the zero-filled NaN rows
+            # tie the whole roster into the chart.
+            top_spoons = display_df.nlargest(15, "Rate Luck Index").iloc[::-1]
+            if top_spoons.empty:
+                # Nothing survived the head selection: skip the whole
+                # Plotly figure build/serialize round trip for the rerun.
+                st.info("No spoons to plot for this category.")
+            else:
+                px = _px()
+                fig_spoon = px.bar(
+                    top_spoons,
+                    x="Rate Luck Index",
+                    y="Player",
+                    orientation="h",
+                    text="Rate Luck Index",
+                    color="Rate Luck Index",
+                    title=f"Top Spoons (Rate-Aware) - {selected_spoon_category}",
+                    category_orders={"Player": top_spoons["Player"].tolist()}
+                )
+                # uirevision lets the frontend diff instead of a
+                # full re-render when unrelated widgets change;
+                # the fixed hovertemplate drops unused hover data.
+                fig_spoon.update_layout(transition_duration=0, uirevision="spoon")
+                fig_spoon.update_traces(hovertemplate="%{y}: %{x}<extra></extra>")
+                st.plotly_chart(
+                    fig_spoon,
+                    use_container_width=True,
+                    config={"responsive": True, "displayModeBar": False},
+                )
+            st.dataframe(table_df, hide_index=True, use_container_width=True)
+        else:
+            st.info("No spooned index rows were generated for this category.")
+
+        # chain + islice: no concatenated list, and at most ten notes
+        # are ever materialized for display.
+        top_notes = list(itertools.islice(
+            itertools.chain(prefetch_errors, message_config_notes, fetch_errors), 10
+        ))
+        if top_notes:
+            # Only the yes/no matters for the banner: one
+            # case-insensitive regex pass, stopping at the
+            # first failure note. The note lists stay short,
+            # so the alternative (pre-lowering every note
+            # into a scratch list) would just add allocations.
+            has_failure = any(
+                _WOM_FAILURE_RE.search(e)
+                for e in itertools.chain(prefetch_errors, message_config_notes, fetch_errors)
+            )
+            warning_title = (
+                "Some Wise Old Man metric pulls failed after automatic retries. Results may be incomplete.\n"
+                if has_failure
+                else "Wise Old Man notes for this result:\n"
+            )
+            st.warning(warning_title + "\n".join(top_notes))
+    else:
+        st.info("No boss categories mapped for Wise Old Man spooned index yet.")
+
+
+
+@st.fragment
+def _render_raw_data(df):
+    st.write("Cleaned Data (Using 'Awarded Points'):")
+    # Ship at most 500 rows to the browser per rerun; serializing the
+    # whole log over the websocket dwarfs every other cost on this tab.
+    n = len(df)
+    if n > 500:
+        start = st.slider("Row window start", 0, max(0, n - 500), 0, step=500)
+        st.caption(f"Showing rows {start}-{min(start + 500, n)} of {n:,}")
+        st.dataframe(df.iloc[start:start + 500], use_container_width=True)
+    else:
+        st.dataframe(df, use_container_width=True)
+
+
 # --- 2. App Interface ---
 def main():
     st.markdown("### Winter Bingo 2026 Dashboard")
@@ -550,44 +1188,57 @@ def main():
         st.header("Data Source")
         uploaded_file = st.file_uploader("Optional: Upload a replacement CSV", type=['csv'])
 
-    data_source = uploaded_file if uploaded_file is not None else (DEFAULT_CSV_PATH if DEFAULT_CSV_PATH.exists() else None)
+    if uploaded_file is not None:
+        df = load_and_clean_data(uploaded_file)
+    elif DEFAULT_CSV_PATH.exists():
+        csv_stat = DEFAULT_CSV_PATH.stat()
+        df = load_and_clean_data_from_path(str(DEFAULT_CSV_PATH), csv_stat.st_mtime_ns, csv_stat.st_size)
+    else:
+        df = None
+
+    if df is not None:
 
-    if data_source is not None:
-        df = load_and_clean_data(data_source)
-        
         if not df.empty:
+            # Aggregate once and reuse across the KPI row and leaderboards.
+            player_points = _points_by(df, 'Player')
+            team_points = _points_by(df, 'Team')
+            category_options, player_options, item_options, team_options = option_lists(df)
+
             # --- KPI ROW ---
             col1, col2, col3, col4 = st.columns(4)
             col1.metric("Total Drops", len(df))
-            col2.metric("Total Points", f"{int(df['Points'].sum()):,}")
-            
-            top_player = df.groupby('Player')['Points'].sum().idxmax()
-            top_player_score = df.groupby('Player')['Points'].sum().max()
-            col3.metric("MVP Player", top_player, f"{int(top_player_score)} pts")
-            
-            top_team = df.groupby('Team')['Points'].sum().idxmax()
-            col4.metric("Leading Team", top_team.split('-')[0]) 
+            # The grand total is just the per-player totals summed — no
+            # need for a second pass over the full Points column.
+            player_values = player_points.to_numpy()
+            col2.metric("Total Points", f"{int(player_values.sum()):,}")
+
+            # np.argmax on the underlying array, then one positional index
+            # lookup — no Python-level walk over the index values.
+            top_idx = int(np.argmax(player_values))
+            col3.metric("MVP Player", player_points.index[top_idx], f"{int(player_values[top_idx])} pts")
+
+            team_values = team_points.to_numpy()
+            top_team = team_points.index[int(np.argmax(team_values))]
+            col4.metric("Leading Team", top_team.split('-')[0])
 
             st.divider()
             event_start_date = df["Date"].min()
             event_end_date = df["Date"].max()
             event_start_date_str = event_start_date.strftime("%Y-%m-%d")
             event_end_date_str = event_end_date.strftime("%Y-%m-%d")
-            prefetch_metrics = sorted(
-                {
-                    metric
-                    for category_metrics in CATEGORY_TO_WOM_BOSSES.values()
-                    for metric in category_metrics
-                    if metric in SUPPORTED_WOM_BOSS_METRICS
-                }
-            )
             prefetched_kc_by_metric, prefetch_errors = load_wom_group_metrics_from_file(
                 str(WOM_CACHE_FILE),
                 WOM_GROUP_ID,
                 event_start_date_str,
                 event_end_date_str,
-                tuple(prefetch_metrics)
+                PREFETCH_METRICS
             )
+            # Wide (player key × metric) KC table, built once per render:
+            # the tabs index into it instead of re-summing the per-metric
+            # dicts for every player on every interaction.
+            kc_wide = pd.DataFrame(prefetched_kc_by_metric).fillna(0.0)
+            player_kc_total = kc_wide.sum(axis=1)
+            wom_key_by_player = wom_key_map(tuple(player_options))
             boss_speeds, items_db, message_config_notes = load_spoon_config_from_message(str(MESSAGE_CONFIG_FILE))
 
             # --- TABS ---
@@ -602,349 +1253,41 @@ def main():
                 "💾 Cleaned Data"
             ])
 
-            # TAB 1: LEADERBOARDS
             with tab_leader:
-                c1, c2 = st.columns(2)
-                
-                with c1:
-                    st.subheader("Team Standings (Official)")
-                    # Group by Team and Sum the CORRECTED points
-                    team_df = df.groupby('Team')['Points'].sum().reset_index().sort_values('Points', ascending=False)
-                    team_df.index = range(1, len(team_df) + 1)
-                    
-                    # Format points to be integers if they are whole numbers
-                    team_df['Points'] = team_df['Points'].apply(lambda x: int(x) if x.is_integer() else x)
-                    
-                    st.dataframe(team_df, use_container_width=True)
-
-                with c2:
-                    st.subheader("Top 10 Players")
-                    player_df = df.groupby('Player')['Points'].sum().reset_index().sort_values('Points', ascending=False).head(10)
-                    fig_player = px.bar(player_df, x='Points', y='Player', orientation='h', text='Points', color='Points')
-                    fig_player.update_layout(yaxis={'categoryorder':'total ascending'})
-                    st.plotly_chart(fig_player, use_container_width=True)
-
-            # TAB 2: ITEM STATS
+                _render_leaderboards(team_points, player_points)
+
             with tab_items:
-                col_filter, col_chart = st.columns([1, 3])
-                
-                with col_filter:
-                    st.write("### Filters")
-                    selected_category = st.selectbox("Filter by Tile/Category", ["All"] + sorted(df['Category'].dropna().unique()))
-                
-                with col_chart:
-                    viz_df = df if selected_category == "All" else df[df['Category'] == selected_category]
-                    
-                    st.subheader(f"Most Acquired Items ({selected_category})")
-                    item_counts = viz_df['Item'].value_counts().reset_index().head(15)
-                    item_counts.columns = ['Item', 'Count']
-                    
-                    fig_items = px.bar(item_counts, x='Count', y='Item', orientation='h', title="Top Drops by Quantity")
-                    fig_items.update_layout(yaxis={'categoryorder':'total ascending'})
-                    st.plotly_chart(fig_items, use_container_width=True)
-                    
-                    st.write("### High Value Drops")
-                    high_value = viz_df[viz_df['Points'] >= 5].sort_values('Date', ascending=False).head(10)
-                    st.dataframe(high_value[['Date', 'Player', 'Item', 'Points']], hide_index=True, use_container_width=True)
-
-            # TAB 3: INDIVIDUAL PLAYER
+                _render_item_stats(df, category_options)
+
             with tab_player:
-                players_list = sorted(df['Player'].unique())
-                selected_player = st.selectbox("Select a Player", players_list)
-                
-                if selected_player:
-                    p_data = df[df['Player'] == selected_player]
-                    wom_lookup_key = _resolve_csv_player_to_wom_key(selected_player)
-                    player_total_kc_gain = sum(
-                        prefetched_kc_by_metric.get(metric_name, {}).get(wom_lookup_key, 0.0)
-                        for metric_name in prefetch_metrics
-                    )
-                    player_total_kc_display = (
-                        f"{int(player_total_kc_gain):,}"
-                        if player_total_kc_gain > 0
-                        else "No WoM Data"
-                    )
-                    
-                    pk1, pk2, pk3, pk4 = st.columns(4)
-                    pk1.metric("Submissions", len(p_data))
-                    pk2.metric("Total Points", int(p_data['Points'].sum()))
-                    pk3.metric("Favorite Tile", p_data['Category'].mode()[0] if not p_data.empty else "N/A")
-                    pk4.metric("WoM KC (Event)", player_total_kc_display)
-                    
-                    st.write(f"### Submission History for {selected_player}")
-                    st.dataframe(
-                        p_data[['Date', 'Category', 'Item', 'Points']].sort_values('Date', ascending=False),
-                        use_container_width=True
-                    )
+                _render_individual_search(df, player_options, player_kc_total, wom_key_by_player)
 
-            # TAB 4: PLAYER RANKINGS
             with tab_rankings:
-                st.subheader("Top Players by Category")
-                categories = sorted(df['Category'].dropna().unique())
-                if categories:
-                    selected_rank_category = st.selectbox(
-                        "Choose a Category",
-                        categories,
-                        key="rank_category"
-                    )
-
-                    cat_rank_df = (
-                        df[df['Category'] == selected_rank_category]
-                        .groupby('Player', as_index=False)['Points']
-                        .sum()
-                        .sort_values('Points', ascending=False)
-                    )
-                    cat_rank_df.insert(0, "Rank", range(1, len(cat_rank_df) + 1))
-                    st.dataframe(cat_rank_df[['Rank', 'Player', 'Points']], hide_index=True, use_container_width=True)
-                else:
-                    st.info("No categories found in the uploaded data.")
-
-                st.divider()
-
-                st.subheader("Top Players by Item")
-                items = sorted(df['Item'].dropna().unique())
-                if items:
-                    selected_rank_item = st.selectbox(
-                        "Choose an Item",
-                        items,
-                        key="rank_item"
-                    )
+                _render_player_rankings(df, category_options, item_options)
 
-                    item_rank_df = (
-                        df[df['Item'] == selected_rank_item]
-                        .groupby('Player', as_index=False)['Points']
-                        .sum()
-                        .sort_values('Points', ascending=False)
-                    )
-                    item_rank_df.insert(0, "Rank", range(1, len(item_rank_df) + 1))
-                    st.dataframe(item_rank_df[['Rank', 'Player', 'Points']], hide_index=True, use_container_width=True)
-                else:
-                    st.info("No items found in the uploaded data.")
-
-            # TAB 5: TEAM RANKINGS
             with tab_team_rankings:
-                st.subheader("Top Players by Team")
-                teams = sorted(df['Team'].dropna().unique())
-                if teams:
-                    selected_team = st.selectbox("Choose a Team", teams, key="rank_team")
-
-                    team_player_rank_df = (
-                        df[df['Team'] == selected_team]
-                        .groupby('Player', as_index=False)['Points']
-                        .sum()
-                        .sort_values('Points', ascending=False)
-                    )
-                    team_player_rank_df.insert(0, "Rank", range(1, len(team_player_rank_df) + 1))
-                    st.dataframe(
-                        team_player_rank_df[['Rank', 'Player', 'Points']],
-                        hide_index=True,
-                        use_container_width=True
-                    )
+                _render_team_rankings(df, team_options)
 
-                    st.divider()
-                    st.subheader(f"{selected_team} Item Points by Category")
-                    team_df = df[df['Team'] == selected_team]
-                    team_categories = sorted(team_df['Category'].dropna().unique())
-
-                    if team_categories:
-                        selected_team_category = st.selectbox(
-                            "Choose a Category",
-                            team_categories,
-                            key="rank_team_category"
-                        )
-
-                        team_item_points_df = (
-                            team_df[team_df['Category'] == selected_team_category]
-                            .groupby('Item', as_index=False)['Points']
-                            .sum()
-                            .sort_values('Points', ascending=False)
-                        )
-                        team_item_points_df.insert(0, "Rank", range(1, len(team_item_points_df) + 1))
-
-                        fig_team_items = px.bar(
-                            team_item_points_df.head(20),
-                            x='Points',
-                            y='Item',
-                            orientation='h',
-                            text='Points',
-                            color='Points',
-                            title=f"{selected_team} - {selected_team_category}: Points by Item"
-                        )
-                        fig_team_items.update_layout(yaxis={'categoryorder': 'total ascending'})
-                        st.plotly_chart(fig_team_items, use_container_width=True)
-                        st.dataframe(
-                            team_item_points_df[['Rank', 'Item', 'Points']],
-                            hide_index=True,
-                            use_container_width=True
-                        )
-                    else:
-                        st.info("No categories found for this team.")
-                else:
-                    st.info("No teams found in the uploaded data.")
-
-            # TAB 6: HIGHEST KC
             with tab_highest_kc:
-                st.subheader("Highest KC by Category")
-                st.caption(
-                    f"Using cached WOM data from {WOM_CACHE_FILE.name} for range "
-                    f"{event_start_date_str} to {event_end_date_str}."
-                )
-
-                available_kc_categories = sorted(
-                    [
-                        cat for cat in df["Category"].dropna().unique()
-                        if cat in CATEGORY_TO_WOM_BOSSES
-                    ]
-                )
-
-                if available_kc_categories:
-                    selected_kc_category = st.selectbox(
-                        "Choose a Category",
-                        available_kc_categories,
-                        key="highest_kc_category"
-                    )
-                    selected_kc_metrics = [
-                        metric for metric in CATEGORY_TO_WOM_BOSSES[selected_kc_category]
-                        if metric in SUPPORTED_WOM_BOSS_METRICS
-                    ]
-
-                    if selected_kc_metrics:
-                        category_points_by_player = (
-                            df[df["Category"] == selected_kc_category]
-                            .groupby("Player", as_index=False)["Points"]
-                            .sum()
-                        )
-
-                        kc_rows = []
-                        for player in sorted(df["Player"].dropna().unique()):
-                            wom_lookup_key = _resolve_csv_player_to_wom_key(player)
-                            player_kc_gain = sum(
-                                prefetched_kc_by_metric.get(metric_name, {}).get(wom_lookup_key, 0.0)
-                                for metric_name in selected_kc_metrics
-                            )
-                            player_points = float(
-                                category_points_by_player.loc[
-                                    category_points_by_player["Player"] == player,
-                                    "Points"
-                                ].sum()
-                            )
-                            kc_rows.append(
-                                {
-                                    "Player": player,
-                                    "KC Gain": round(player_kc_gain, 2),
-                                    "Points": round(player_points, 2),
-                                }
-                            )
-
-                        kc_df = pd.DataFrame(kc_rows).sort_values(
-                            by=["KC Gain", "Points"],
-                            ascending=[False, False]
-                        ).reset_index(drop=True)
-                        kc_df.insert(0, "Rank", range(1, len(kc_df) + 1))
-
-                        fig_kc = px.bar(
-                            kc_df.head(20),
-                            x="KC Gain",
-                            y="Player",
-                            orientation="h",
-                            text="KC Gain",
-                            color="KC Gain",
-                            title=f"Top KC Gains - {selected_kc_category}"
-                        )
-                        fig_kc.update_layout(yaxis={"categoryorder": "total ascending"})
-                        st.plotly_chart(fig_kc, use_container_width=True)
-                        st.dataframe(kc_df, hide_index=True, use_container_width=True)
-                    else:
-                        st.info("No supported WOM boss metrics are mapped for this category.")
-                else:
-                    st.info("No categories available for Highest KC view.")
+                _render_highest_kc(df, kc_wide, wom_key_by_player, category_options, player_options, event_start_date_str, event_end_date_str)
 
             # TAB 7: SPOONED INDEX
             with tab_spooned:
-                st.subheader("Biggest Spoons by Boss KC Gain")
-                st.caption(
-                    f"Using Wise Old Man group pulls (group {WOM_GROUP_ID}, competition ref {WOM_COMPETITION_ID}) "
-                    "from a committed cache file for fast category switching."
-                )
-                st.caption(
-                    f"Cached WOM event range: {event_start_date_str} to {event_end_date_str} "
-                    f"({len(prefetch_metrics)} metrics) from {WOM_CACHE_FILE.name}"
-                )
-                available_spoon_categories = sorted(
-                    [cat for cat in df["Category"].dropna().unique() if cat in CATEGORY_TO_WOM_BOSSES]
+                _render_spooned_index(
+                    df,
+                    category_options,
+                    prefetched_kc_by_metric,
+                    prefetch_errors,
+                    message_config_notes,
+                    boss_speeds,
+                    items_db,
+                    wom_key_by_player,
+                    event_start_date_str,
+                    event_end_date_str,
                 )
 
-                if available_spoon_categories:
-                    selected_spoon_category = st.selectbox(
-                        "Choose a Boss Category",
-                        available_spoon_categories,
-                        key="spoon_category"
-                    )
-                    selected_metrics = CATEGORY_TO_WOM_BOSSES[selected_spoon_category]
-
-                    spoon_category_df = df[df["Category"] == selected_spoon_category].copy()
-                    spoon_df, start_date, end_date, fetch_errors = build_spooned_index(
-                        spoon_category_df,
-                        selected_metrics,
-                        prefetched_kc_by_metric,
-                        boss_speeds,
-                        items_db
-                    )
-
-                    if start_date is not None and end_date is not None:
-                        st.caption(
-                            f"Wise Old Man KC range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-                        )
-
-                    if not spoon_df.empty:
-                        display_df = spoon_df.copy()
-                        display_df["Rate Luck Index"] = display_df["Rate Luck Index"].fillna(0)
-                        table_df = spoon_df.copy()
-                        table_df["WoM Data Status"] = ""
-                        table_df.loc[
-                            (table_df["Points"] > 0)
-                            & ((table_df["KC Gain"] <= 0) | (table_df["Expected Points"] <= 0)),
-                            "WoM Data Status"
-                        ] = "No WoM Data"
-
-                        fig_spoon = px.bar(
-                            display_df.head(15),
-                            x="Rate Luck Index",
-                            y="Player",
-                            orientation="h",
-                            text="Rate Luck Index",
-                            color="Rate Luck Index",
-                            title=f"Top Spoons (Rate-Aware) - {selected_spoon_category}"
-                        )
-                        fig_spoon.update_layout(yaxis={"categoryorder": "total ascending"})
-                        st.plotly_chart(fig_spoon, use_container_width=True)
-                        st.dataframe(table_df, hide_index=True, use_container_width=True)
-                    else:
-                        st.info("No spooned index rows were generated for this category.")
-
-                    all_wom_notes = prefetch_errors + message_config_notes + fetch_errors
-                    if all_wom_notes:
-                        request_failures = [
-                            e for e in all_wom_notes
-                            if "request failed" in e.lower() or "rate limited" in e.lower()
-                        ]
-                        warning_title = (
-                            "Some Wise Old Man metric pulls failed after automatic retries. Results may be incomplete.\n"
-                            if request_failures
-                            else "Wise Old Man notes for this result:\n"
-                        )
-                        st.warning(
-                            warning_title
-                            + "\n".join(all_wom_notes[:10])
-                        )
-                else:
-                    st.info("No boss categories mapped for Wise Old Man spooned index yet.")
-
-            # TAB 8: RAW DATA
             with tab_raw:
-                st.write("Cleaned Data (Using 'Awarded Points'):")
-                st.dataframe(df, use_container_width=True)
-
+                _render_raw_data(df)
     else:
         st.info(f"👋 No CSV available. Add {DEFAULT_CSV_PATH.name} to the app folder or upload a CSV.")
 
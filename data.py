@@ -0,0 +1,179 @@
+"""Shared CSV loading/cleaning layer for the bingo dashboards.
+
+Keeping the canonical load_and_clean_data here means every app
+entrypoint shares one implementation and one Streamlit cache.
+"""
+import streamlit as st
+import numpy as np
+import pandas as pd
+import polars as pl
+from pathlib import Path
+
+# Only these CSV columns are ever used; projecting at read time skips
+# parsing (and materializing) the rest of the sheet.
+EVENT_CSV_COLUMNS = ['Date', 'Player Name', 'Team', 'Tile', 'Item Received', 'Points', 'Awarded Points']
+# Bump when _clean_event_log changes shape/dtypes so stale Parquet
+# sidecars from older app versions are ignored and rebuilt.
+EVENT_PARQUET_VERSION = 2
+# Translation table that deletes all ASCII whitespace in one C pass.
+_WS_TRANS = str.maketrans('', '', ' \t\n\r\x0b\x0c')
+
+
+def _read_event_csv(source):
+    # Polars' multi-threaded reader parses the CSV (dates included) much
+    # faster than pandas; pandas only sees the already-filtered rows.
+    # Naming every dtype skips inference: try_parse_dates then only
+    # probes Date instead of attempting date parses on the name columns.
+    read_kwargs = {
+        'try_parse_dates': True,
+        'schema_overrides': {
+            'Player Name': pl.Utf8,
+            'Team': pl.Utf8,
+            'Tile': pl.Utf8,
+            'Item Received': pl.Utf8,
+            'Points': pl.Float64,
+            'Awarded Points': pl.Float64,
+        },
+    }
+    if isinstance(source, (str, Path)):
+        try:
+            # Lazy plan: the optimizer fuses projection, filter and casts
+            # into one streaming pass over the file.
+            lf = (
+                pl.scan_csv(source, **read_kwargs)
+                .select(EVENT_CSV_COLUMNS)
+                .filter(pl.col('Team') != '-')
+                .with_columns([pl.col(c).cast(pl.Categorical) for c in ('Team', 'Tile', 'Item Received')])
+            )
+            return lf.collect(engine='streaming').to_pandas()
+        except Exception:
+            # Odd layouts fall through to the eager reader below, which
+            # handles missing columns explicitly.
+            pass
+    try:
+        raw = pl.read_csv(source, columns=EVENT_CSV_COLUMNS, **read_kwargs)
+    except pl.exceptions.ColumnNotFoundError:
+        # Older/odd CSV layouts: read everything and let the cleaning
+        # step report what is missing.
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        raw = pl.read_csv(source, **read_kwargs)
+    if 'Team' in raw.columns:
+        # 1. FILTER: Remove the "malformed" test row (Entry #1899)
+        raw = raw.filter(pl.col('Team') != '-')
+    # Dictionary-encode the stable string columns on the Arrow side so
+    # to_pandas hands over ready-made categoricals instead of building
+    # millions of Python string objects. Player Name is left as string
+    # because the cleaning step still rewrites it.
+    cat_cols = [c for c in ('Team', 'Tile', 'Item Received') if c in raw.columns]
+    if cat_cols:
+        raw = raw.with_columns([pl.col(c).cast(pl.Categorical) for c in cat_cols])
+    return raw.to_pandas()
+
+
+def _sort_category_levels(df):
+    # Categoricals built by Polars/Arrow (CSV cast or Parquet sidecar
+    # round-trip) keep first-appearance order, so re-sort the levels:
+    # option_lists serves the selectboxes straight from .cat.categories.
+    for col in ('Player', 'Team', 'Category', 'Item'):
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    return df
+
+
+def _clean_event_log(source):
+    try:
+        df = _read_event_csv(source)
+        # 2. SELECT: We now grab 'Awarded Points' as our primary source
+        # We rename 'Awarded Points' to 'Points' for the app to use
+        # We keep 'Points' as 'Base_Points' just in case we want to compare later
+
+        # Check if 'Awarded Points' exists, otherwise default to 'Points'
+        if 'Awarded Points' in df.columns:
+            df['Final_Points'] = df['Awarded Points'].fillna(df['Points'])
+        else:
+            df['Final_Points'] = df['Points']
+
+        target_cols = ['Date', 'Player Name', 'Team', 'Tile', 'Item Received', 'Final_Points']
+
+        # Check for missing columns
+        if not all(col in df.columns for col in target_cols):
+             # Fallback for older CSV versions if names differ
+            st.error(f"Missing columns. Found: {df.columns.tolist()}")
+            return pd.DataFrame()
+
+        df = df[target_cols]
+
+        # 3. RENAME: Standardize
+        df.columns = ['Date', 'Player', 'Team', 'Category', 'Item', 'Points']
+        # Lowercase + drop whitespace in two vectorized sweeps; translate
+        # replaces the per-cell regex engine (and covers strip too).
+        df['Player'] = df['Player'].astype(str).str.lower().str.translate(_WS_TRANS)
+
+        # 4. FORMAT: Convert types (Polars usually parses Date already).
+        # The event log uses DD/MM/YYYY; naming the format takes pandas'
+        # vectorized C parser instead of per-row dateutil inference.
+        if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+            try:
+                df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y')
+            except (ValueError, TypeError):
+                df['Date'] = pd.to_datetime(df['Date'], format='mixed', dayfirst=True, errors='coerce')
+        # Keep Points float so .is_integer() display formatting keeps working
+        df['Points'] = pd.to_numeric(df['Points'], errors='coerce').fillna(0).astype('float64')
+        # Constant column: int8 instead of the default int64 keeps the
+        # cached frame (and its Parquet sidecar) small.
+        df['Quantity'] = np.int8(1)
+
+        # Low-cardinality strings: category dtype makes every groupby /
+        # value_counts work on integer codes instead of Python strings.
+        for col in ('Player', 'Team', 'Category', 'Item'):
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+
+        return _sort_category_levels(df)
+
+    except Exception as e:
+        st.error(f"Error processing file: {e}")
+        return pd.DataFrame()
+
+
+@st.cache_data
+def load_and_clean_data(file):
+    # Uploaded files: Streamlit hashes the buffer contents for the cache key.
+    return _clean_event_log(file)
+
+
+@st.cache_data
+def load_and_clean_data_from_path(path_str, mtime_ns, size):
+    # Bundled CSV: key the cache on (path, mtime, size) so the parse is
+    # reused across reruns and only invalidates when the file changes.
+    parquet_path = Path(path_str).with_suffix(f'.v{EVENT_PARQUET_VERSION}.parquet')
+    try:
+        # One-time converted copy: typed columns, no CSV or date parsing.
+        # The Arrow round-trip resets category order to first appearance,
+        # so restore the sorted levels the cleaning step guarantees.
+        if parquet_path.exists() and parquet_path.stat().st_mtime_ns >= mtime_ns:
+            return _sort_category_levels(pl.read_parquet(parquet_path).to_pandas())
+    except Exception:
+        pass
+
+    df = _clean_event_log(path_str)
+    if not df.empty:
+        try:
+            pl.from_pandas(df).write_parquet(parquet_path, compression='zstd')
+        except Exception:
+            # Read-only deployments still work, just without the sidecar.
+            pass
+    return df
+
+
+@st.cache_data
+def option_lists(df):
+    # The categories of a Categorical column are already its sorted,
+    # NaN-free unique values — no per-rerun unique()+sorted() pass needed.
+    return (
+        df['Category'].cat.categories.tolist(),
+        df['Player'].cat.categories.tolist(),
+        df['Item'].cat.categories.tolist(),
+        df['Team'].cat.categories.tolist(),
+    )